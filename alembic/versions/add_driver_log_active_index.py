@@ -0,0 +1,51 @@
+"""Add unique index for active driver vehicle logs
+
+Revision ID: add_driver_log_active_idx
+Revises: add_coffin_checklist
+Create Date: 2026-10-16 09:00:00.000000
+
+Index driver_vehicle_logs on (driver_id, report_id) so that:
+1. end_driver_log finds the active log with an index probe instead of a scan
+2. Only one active log (end_time IS NULL) can exist per driver and report
+
+MySQL has no partial indexes, so the last key part is an expression that is
+1 for active logs and NULL for ended ones (NULLs never collide in a unique
+index). Functional key parts need MySQL 8.0.13+.
+
+The index is also declared on DriverVehicleLog, so a table recreated by
+init_db (create_all) gets it even when this migration found no table.
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = 'add_driver_log_active_idx'
+down_revision = 'add_coffin_checklist'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # driver_vehicle_logs is not created by every schema history
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    if not inspector.has_table('driver_vehicle_logs'):
+        return
+
+    indexes = [index['name'] for index in inspector.get_indexes('driver_vehicle_logs')]
+    if 'ix_driver_log_active' not in indexes:
+        op.execute(
+            "CREATE UNIQUE INDEX ix_driver_log_active ON driver_vehicle_logs "
+            "(driver_id, report_id, ((CASE WHEN end_time IS NULL THEN 1 END)))"
+        )
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    if not inspector.has_table('driver_vehicle_logs'):
+        return
+
+    indexes = [index['name'] for index in inspector.get_indexes('driver_vehicle_logs')]
+    if 'ix_driver_log_active' in indexes:
+        op.drop_index('ix_driver_log_active', table_name='driver_vehicle_logs')
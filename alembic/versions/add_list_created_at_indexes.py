@@ -0,0 +1,37 @@
+"""Add (created_at, id) indexes on users, vehicles and vehicle_types
+
+Revision ID: add_list_created_idx
+Revises: add_reports_created_idx
+Create Date: 2026-10-16 11:00:00.000000
+
+Support keyset pagination of the user, vehicle and vehicle type lists,
+which order by created_at DESC, id DESC and seek past the last
+(created_at, id) seen.
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = 'add_list_created_idx'
+down_revision = 'add_reports_created_idx'
+branch_labels = None
+depends_on = None
+
+TABLES = ['users', 'vehicles', 'vehicle_types']
+
+
+def upgrade():
+    # Tables created by init_db already have the indexes
+    conn = op.get_bind()
+    inspector = inspect(conn)
+
+    for table in TABLES:
+        index_name = f'ix_{table}_created_at_id'
+        indexes = [index['name'] for index in inspector.get_indexes(table)]
+        if index_name not in indexes:
+            op.create_index(index_name, table, ['created_at', 'id'])
+
+
+def downgrade():
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_created_at_id', table_name=table)
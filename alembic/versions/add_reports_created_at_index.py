@@ -0,0 +1,31 @@
+"""Add (created_at, id) index on reports
+
+Revision ID: add_reports_created_idx
+Revises: add_driver_log_active_idx
+Create Date: 2026-10-16 10:00:00.000000
+
+Support keyset pagination of the report list, which orders by
+created_at DESC, id DESC and seeks past the last (created_at, id) seen.
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = 'add_reports_created_idx'
+down_revision = 'add_driver_log_active_idx'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tables created by init_db already have the index
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    indexes = [index['name'] for index in inspector.get_indexes('reports')]
+
+    if 'ix_reports_created_at_id' not in indexes:
+        op.create_index('ix_reports_created_at_id', 'reports', ['created_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_reports_created_at_id', table_name='reports')
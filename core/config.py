@@ -9,11 +9,20 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    # Disable app-side pooling when an external pooler (e.g. ProxySQL) sits in front of MySQL
+    DB_USE_NULL_POOL: bool = False
     
     # JWT
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Reuse bcrypt hashes for repeated plaintexts in admin user creation (bulk imports).
+    # Users sharing a password then share a hash, so keep this off in production.
+    ALLOW_HASH_CACHE: bool = False
     
     # Application
     APP_NAME: str = "PMI Emergency Call System"
@@ -1,16 +1,31 @@
+import asyncio
+from contextlib import AsyncExitStack
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
 from core.config import settings
 
 # Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
-)
+if settings.DB_USE_NULL_POOL:
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        future=True,
+        poolclass=NullPool
+    )
+else:
+    # Keep DB_POOL_SIZE + DB_MAX_OVERFLOW times the worker count below MySQL's max_connections
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        future=True,
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        # Recycle before MySQL's wait_timeout closes idle connections
+        pool_recycle=settings.DB_POOL_RECYCLE
+    )
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -38,5 +53,28 @@ async def init_db():
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def warm_up_pool():
+    """
+    Open every pooled connection up front so the first requests after
+    startup don't pay the connect latency
+    """
+    if settings.DB_USE_NULL_POOL:
+        return
+    
+    async with AsyncExitStack() as stack:
+        # Hold all connections at once, otherwise the pool would hand the same one back
+        await asyncio.gather(*(
+            stack.enter_async_context(engine.connect())
+            for _ in range(settings.DB_POOL_SIZE)
+        ))
+
+
+def pool_status() -> str:
+    """
+    Describe the connection pool state (size, checked in/out, overflow)
+    """
+    return engine.pool.status()
+
+
 async def close_db():
     await engine.dispose()
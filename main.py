@@ -1,8 +1,9 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from core.config import settings
-from db.session import init_db, close_db
+from db.session import init_db, warm_up_pool, close_db, pool_status
 
 # Import routers
 from routes import auth, reports, users, vehicle_types, vehicles, assignments, driver_locations
@@ -16,6 +17,7 @@ async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Starting PMI Emergency Call System...")
     await init_db()
+    await warm_up_pool()
     print("✅ Database initialized")
     
     yield
@@ -31,7 +33,9 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="Sistem Tanggap Darurat Palang Merah Indonesia",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # Encode every JSON response with orjson
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -100,3 +104,12 @@ async def health_check():
         "service": settings.APP_NAME,
         "version": settings.APP_VERSION
     }
+
+
+if settings.DEBUG:
+    @app.get("/debug/pool")
+    async def debug_pool():
+        """
+        Connection pool status (DEBUG only)
+        """
+        return {"pool": pool_status()}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Text, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -18,6 +18,19 @@ class DriverVehicleLog(Base):
     start_location = Column(Text, nullable=True)
     end_location = Column(Text, nullable=True)
     
+    __table_args__ = (
+        # At most one active log (end_time IS NULL) per driver and report; the
+        # last key part is 1 for active logs and NULL (never colliding) otherwise
+        Index(
+            "ix_driver_log_active",
+            driver_id,
+            report_id,
+            # MySQL wants functional key parts in their own parentheses
+            text("(CASE WHEN end_time IS NULL THEN 1 END)"),
+            unique=True
+        ),
+    )
+    
     # Relationships
     driver = relationship("User", back_populates="driver_logs")
     vehicle = relationship("Vehicle", back_populates="driver_logs")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Boolean, Date, Time
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Boolean, Date, Time, Index
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -8,6 +8,10 @@ import uuid
 
 class Report(Base):
     __tablename__ = "reports"
+    __table_args__ = (
+        # Keyset pagination order (newest first)
+        Index("ix_reports_created_at_id", "created_at", "id"),
+    )
     
     id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     
@@ -1,15 +1,19 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from db.session import Base
-import uuid
+from utils.ids import new_id
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination order (newest first)
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
     
-    id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(CHAR(36), primary_key=True, default=new_id)
     name = Column(String(255), nullable=False)
     email = Column(String(255), unique=True, nullable=False, index=True)
     password = Column(String(255), nullable=False)
@@ -1,15 +1,19 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from db.session import Base
-import uuid
+from utils.ids import new_id
 
 
 class VehicleType(Base):
     __tablename__ = "vehicle_types"
+    __table_args__ = (
+        # Keyset pagination order (newest first)
+        Index("ix_vehicle_types_created_at_id", "created_at", "id"),
+    )
     
-    id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(CHAR(36), primary_key=True, default=new_id)
     name = Column(String(100), nullable=False, unique=True)  # patient_transport, mortuary_transport
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
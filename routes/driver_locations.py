@@ -83,8 +83,8 @@ async def get_driver_latest_location(
 @router.get("/{driver_id}/history", status_code=status.HTTP_200_OK)
 async def get_driver_location_history(
     driver_id: str,
-    page: int = 1,
-    size: int = 50,
+    page: int = Query(1, ge=1),
+    size: int = Query(50, ge=1, le=500),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -94,7 +94,7 @@ async def get_driver_location_history(
     Args:
         driver_id: Driver ID
         page: Page number (default: 1)
-        size: Items per page (default: 50)
+        size: Items per page (default: 50, max: 500)
         db: Database session
         current_user: Current authenticated user
         
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 from db.session import get_db
 from core.dependencies import get_current_user
 from models.user import User
@@ -12,8 +12,9 @@ router = APIRouter()
 
 @router.get("/", status_code=status.HTTP_200_OK)
 async def get_all_reports(
-    page: int = 1,
-    size: int = 10,
+    page: int = Query(1, ge=1),
+    size: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -22,14 +23,15 @@ async def get_all_reports(
     
     Args:
         page: Page number (default: 1)
-        size: Items per page (default: 10)
+        size: Items per page (default: 10, max: 100)
+        cursor: Keyset cursor from pagination.next_cursor (optional, overrides page)
         db: Database session
         current_user: Current authenticated user
         
     Returns:
         Paginated list of reports
     """
-    return await new_report_service.get_all_reports(db, current_user, page, size)
+    return await new_report_service.get_all_reports(db, current_user, page, size, cursor)
 
 
 @router.get("/{report_id}", status_code=status.HTTP_200_OK)
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 from db.session import get_db
 from core.dependencies import get_current_user
 from models.user import User
@@ -12,9 +12,10 @@ router = APIRouter()
 
 @router.get("/", status_code=status.HTTP_200_OK)
 async def get_all_users(
-    page: int = 1,
-    size: int = 10,
+    page: int = Query(1, ge=1),
+    size: int = Query(10, ge=1),
     role: str = None,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -25,13 +26,14 @@ async def get_all_users(
         page: Page number (default: 1)
         size: Items per page (default: 10)
         role: Filter by role (optional)
+        cursor: Keyset cursor from pagination.next_cursor (optional, overrides page)
         db: Database session
         current_user: Current authenticated user
         
     Returns:
         Paginated list of all users
     """
-    return await user_service.get_all_users(db, current_user, page, size, role)
+    return await user_service.get_all_users(db, current_user, page, size, role, cursor)
 
 
 @router.get("/{user_id}", status_code=status.HTTP_200_OK)
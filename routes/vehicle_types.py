@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from db.session import get_db
@@ -12,8 +12,9 @@ router = APIRouter()
 
 @router.get("/", status_code=status.HTTP_200_OK)
 async def get_all_vehicle_types(
-    page: int = 1,
-    size: int = 10,
+    page: int = Query(1, ge=1),
+    size: int = Query(10, ge=1),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: Optional[User] = Depends(get_optional_current_user)
 ):
@@ -23,13 +24,14 @@ async def get_all_vehicle_types(
     Args:
         page: Page number (default: 1)
         size: Items per page (default: 10)
+        cursor: Keyset cursor from pagination.next_cursor (optional, overrides page)
         db: Database session
         current_user: Current authenticated user (optional)
         
     Returns:
         Paginated list of vehicle types
     """
-    return await vehicle_type_service.get_all_vehicle_types(db, page, size)
+    return await vehicle_type_service.get_all_vehicle_types(db, page, size, cursor)
 
 
 @router.get("/{vehicle_type_id}", status_code=status.HTTP_200_OK)
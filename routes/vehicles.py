@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 from db.session import get_db
 from core.dependencies import get_current_user
 from models.user import User
@@ -12,9 +12,10 @@ router = APIRouter()
 
 @router.get("/", status_code=status.HTTP_200_OK)
 async def get_all_vehicles(
-    page: int = 1,
-    size: int = 10,
+    page: int = Query(1, ge=1),
+    size: int = Query(10, ge=1),
     status: str = None,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -25,13 +26,14 @@ async def get_all_vehicles(
         page: Page number (default: 1)
         size: Items per page (default: 10)
         status: Filter by status (optional)
+        cursor: Keyset cursor from pagination.next_cursor (optional, overrides page)
         db: Database session
         current_user: Current authenticated user
         
     Returns:
         Paginated list of vehicles
     """
-    return await vehicle_service.get_all_vehicles(db, page, size, status)
+    return await vehicle_service.get_all_vehicles(db, page, size, status, cursor)
 
 
 @router.get("/{vehicle_id}", status_code=status.HTTP_200_OK)
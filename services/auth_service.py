@@ -1,4 +1,5 @@
 from typing import Optional
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from fastapi import HTTPException, status
@@ -33,7 +34,8 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> Opti
     print(f"🔐 DEBUG: Stored password hash (first 20 chars): {user.password[:20] if user.password else 'EMPTY'}...")
     print(f"🔐 DEBUG: Password hash length: {len(user.password) if user.password else 0}")
     
-    is_valid = verify_password(password, user.password)
+    # bcrypt is CPU-bound, run it off the event loop
+    is_valid = await asyncio.to_thread(verify_password, password, user.password)
     print(f"🔐 DEBUG: Password verification result: {is_valid}")
     
     if not is_valid:
@@ -116,7 +118,7 @@ async def register(db: AsyncSession, user_data: UserCreate) -> dict:
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await asyncio.to_thread(get_password_hash, user_data.password)
     new_user = User(
         name=user_data.name,
         email=user_data.email,
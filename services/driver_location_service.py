@@ -1,36 +1,61 @@
 from typing import List, Optional
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, desc, func
 from fastapi import HTTPException, status
+from models.assignment import Assignment
 from models.driver_location import DriverLocation
+from models.report import Report
 from models.user import User
-from schemas.driver_location import DriverLocationCreate, DriverLocationResponse
-from utils.response import success_response, paginated_response
-import uuid
+from models.vehicle import Vehicle
+from models.vehicle_type import VehicleType
+from schemas.driver_location import DriverLocationCreate
+from utils.response import success_response, paginated_stream_response
 
 
-async def create_driver_location(
-    db: AsyncSession,
-    location_data: DriverLocationCreate,
-    current_user: User
-) -> dict:
+def _loc_to_dict(loc: DriverLocation) -> dict:
     """
-    Create new driver location entry
+    Build the DriverLocationResponse payload directly from a DB row
+    
+    Rows already match the response schema, so this skips Pydantic
+    validation and emits JSON-ready values.
+    
+    Args:
+        loc: Driver location row
+        
+    Returns:
+        Driver location data
+    """
+    return {
+        "id": loc.id,
+        "driver_id": loc.driver_id,
+        "latitude": float(loc.latitude),
+        "longitude": float(loc.longitude),
+        "timestamp": loc.timestamp.isoformat(),
+        "assignment_id": loc.assignment_id
+    }
+
+
+async def _get_driver(db: AsyncSession, driver_id: str, current_user: User) -> User:
+    """
+    Get driver by ID, reusing the authenticated user when they are that driver
     
     Args:
         db: Database session
-        location_data: Location data
+        driver_id: Driver ID
         current_user: Current authenticated user
         
     Returns:
-        Created driver location data
+        Driver user object
         
     Raises:
-        HTTPException: If validation fails
+        HTTPException: If driver not found
     """
-    # Verify driver exists
+    if current_user.role == "driver" and current_user.id == driver_id:
+        return current_user
+    
     result = await db.execute(
-        select(User).where(and_(User.id == location_data.driver_id, User.role == "driver"))
+        select(User).where(and_(User.id == driver_id, User.role == "driver"))
     )
     driver = result.scalar_one_or_none()
     
@@ -40,6 +65,28 @@ async def create_driver_location(
             detail="Driver tidak ditemukan"
         )
     
+    return driver
+
+
+async def create_driver_location(
+    db: AsyncSession,
+    location_data: DriverLocationCreate,
+    current_user: User
+) -> dict:
+    """
+    Create new driver location entry
+    
+    Args:
+        db: Database session
+        location_data: Location data
+        current_user: Current authenticated user
+        
+    Returns:
+        Created driver location data
+        
+    Raises:
+        HTTPException: If validation fails
+    """
     # Driver can only create location for themselves
     if current_user.role == "driver" and current_user.id != location_data.driver_id:
         raise HTTPException(
@@ -47,9 +94,11 @@ async def create_driver_location(
             detail="Driver hanya dapat mengirim lokasi sendiri"
         )
     
-    # Create new location entry
+    # Verify driver exists
+    await _get_driver(db, location_data.driver_id, current_user)
+    
+    # Create new location entry (id comes from the column default)
     new_location = DriverLocation(
-        id=str(uuid.uuid4()),
         driver_id=location_data.driver_id,
         latitude=location_data.latitude,
         longitude=location_data.longitude,
@@ -58,11 +107,12 @@ async def create_driver_location(
     
     db.add(new_location)
     await db.commit()
-    await db.refresh(new_location)
+    # Only the server-generated timestamp is unknown after the insert
+    await db.refresh(new_location, ["timestamp"])
     
     return success_response(
         message="Lokasi driver berhasil ditambahkan",
-        data=DriverLocationResponse.model_validate(new_location).model_dump()
+        data=_loc_to_dict(new_location)
     )
 
 
@@ -86,16 +136,7 @@ async def get_driver_latest_location(
         HTTPException: If driver not found
     """
     # Verify driver exists
-    result = await db.execute(
-        select(User).where(and_(User.id == driver_id, User.role == "driver"))
-    )
-    driver = result.scalar_one_or_none()
-    
-    if not driver:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Driver tidak ditemukan"
-        )
+    driver = await _get_driver(db, driver_id, current_user)
     
     # Get latest location
     result = await db.execute(
@@ -112,7 +153,7 @@ async def get_driver_latest_location(
             detail="Lokasi driver tidak ditemukan"
         )
     
-    location_dict = DriverLocationResponse.model_validate(location).model_dump()
+    location_dict = _loc_to_dict(location)
     location_dict["driver_name"] = driver.name
     
     return success_response(
@@ -139,7 +180,7 @@ async def get_driver_location_history(
         size: Items per page (default: 50)
         
     Returns:
-        Paginated list of driver locations
+        Streaming paginated list of driver locations
         
     Raises:
         HTTPException: If not admin or driver not found
@@ -150,18 +191,6 @@ async def get_driver_location_history(
             detail="Anda tidak memiliki akses untuk melihat riwayat lokasi"
         )
     
-    # Verify driver exists
-    result = await db.execute(
-        select(User).where(and_(User.id == driver_id, User.role == "driver"))
-    )
-    driver = result.scalar_one_or_none()
-    
-    if not driver:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Driver tidak ditemukan"
-        )
-    
     # Driver can only see their own history
     if current_user.role == "driver" and current_user.id != driver_id:
         raise HTTPException(
@@ -169,30 +198,34 @@ async def get_driver_location_history(
             detail="Driver hanya dapat melihat riwayat lokasi sendiri"
         )
     
+    # Verify driver exists
+    await _get_driver(db, driver_id, current_user)
+    
     # Get total count
     total_result = await db.execute(
         select(func.count()).select_from(DriverLocation).where(DriverLocation.driver_id == driver_id)
     )
     total = total_result.scalar()
     
-    # Get location history
-    result = await db.execute(
+    # Get location history (streamed, rows are encoded as they arrive)
+    result = await db.stream_scalars(
         select(DriverLocation)
         .where(DriverLocation.driver_id == driver_id)
         .order_by(desc(DriverLocation.timestamp))
         .offset((page - 1) * size)
         .limit(size)
     )
-    locations = result.scalars().all()
     
-    locations_list = [
-        DriverLocationResponse.model_validate(loc).model_dump()
-        for loc in locations
-    ]
+    async def locations():
+        try:
+            async for loc in result:
+                yield _loc_to_dict(loc)
+        finally:
+            await result.close()
     
-    return paginated_response(
+    return paginated_stream_response(
         message="Riwayat lokasi driver berhasil diambil",
-        items=locations_list,
+        items=locations(),
         total=total,
         page=page,
         size=size
@@ -223,11 +256,6 @@ async def get_all_active_driver_locations(
             detail="Hanya admin dan reporter yang dapat melihat semua lokasi driver"
         )
     
-    # Import models here to avoid circular imports
-    from models.assignment import Assignment
-    from models.report import Report
-    from models.vehicle import Vehicle
-    
     # Get all drivers
     result = await db.execute(select(User).where(User.role == "driver"))
     drivers = result.scalars().all()
@@ -250,33 +278,25 @@ async def get_all_active_driver_locations(
         
         if location:
             # Driver has location data
-            location_dict = DriverLocationResponse.model_validate(location).model_dump()
+            location_dict = _loc_to_dict(location)
             location_dict["driver_name"] = driver.name
             location_dict["has_location"] = True
             
             # If there's an assignment, get full assignment and report details
             if location.assignment_id:
-                assignment_result = await db.execute(
-                    select(Assignment).where(Assignment.id == location.assignment_id)
-                )
-                assignment = assignment_result.scalar_one_or_none()
+                assignment = await db.get(Assignment, location.assignment_id)
                 
                 if assignment:
-                    # Get vehicle info
-                    vehicle_result = await db.execute(
-                        select(Vehicle).where(Vehicle.id == assignment.vehicle_id)
-                    )
-                    vehicle = vehicle_result.scalar_one_or_none()
-                    
-                    if vehicle:
-                        location_dict["vehicle_license_plate"] = vehicle.plate_number
-                        location_dict["vehicle_name"] = vehicle.name
+                    # Get vehicle info (assignments may not have a vehicle yet)
+                    if assignment.vehicle_id:
+                        vehicle = await db.get(Vehicle, assignment.vehicle_id)
+                        
+                        if vehicle:
+                            location_dict["vehicle_license_plate"] = vehicle.plate_number
+                            location_dict["vehicle_name"] = vehicle.name
                     
                     # Get report info
-                    report_result = await db.execute(
-                        select(Report).where(Report.id == assignment.report_id)
-                    )
-                    report = report_result.scalar_one_or_none()
+                    report = await db.get(Report, assignment.report_id)
                     
                     if report:
                         # If report is done or canceled, mark driver as idle (not on duty)
@@ -286,13 +306,9 @@ async def get_all_active_driver_locations(
                             # Don't include completed assignment details
                         else:
                             # Get transport type name from VehicleType
-                            from models.vehicle_type import VehicleType
                             transport_type_name = None
                             if report.transport_type:
-                                vt_result = await db.execute(
-                                    select(VehicleType).where(VehicleType.id == report.transport_type)
-                                )
-                                vt = vt_result.scalar_one_or_none()
+                                vt = await db.get(VehicleType, report.transport_type)
                                 if vt:
                                     transport_type_name = vt.name
                             
@@ -315,7 +331,6 @@ async def get_all_active_driver_locations(
             driver_locations.append(location_dict)
         else:
             # Driver has NO location data yet - create placeholder entry
-            from datetime import datetime
             location_dict = {
                 "id": f"no-location-{driver.id}",
                 "driver_id": driver.id,
@@ -1,12 +1,14 @@
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from models.driver_log import DriverVehicleLog
 from models.user import User
 from models.vehicle import Vehicle
 from models.report import Report
 from schemas.driver_log import DriverVehicleLogCreate, DriverVehicleLogComplete
+from utils.db import is_duplicate_entry
 import uuid
 from datetime import datetime
 
@@ -53,20 +55,8 @@ async def start_driver_log(
         Created driver log
         
     Raises:
-        HTTPException: If validation fails
+        HTTPException: If validation fails or an active log already exists
     """
-    # Verify driver exists
-    result = await db.execute(
-        select(User).where(and_(User.id == log_data.driver_id, User.role == "driver"))
-    )
-    driver = result.scalar_one_or_none()
-    
-    if not driver:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Driver tidak ditemukan"
-        )
-    
     # Driver can only create log for themselves
     if current_user.role == "driver" and current_user.id != log_data.driver_id:
         raise HTTPException(
@@ -74,6 +64,19 @@ async def start_driver_log(
             detail="Driver hanya dapat membuat log untuk diri sendiri"
         )
     
+    # Verify driver exists (the authenticated driver is already known to exist)
+    if not (current_user.role == "driver" and current_user.id == log_data.driver_id):
+        result = await db.execute(
+            select(User).where(and_(User.id == log_data.driver_id, User.role == "driver"))
+        )
+        driver = result.scalar_one_or_none()
+        
+        if not driver:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Driver tidak ditemukan"
+            )
+    
     # Verify vehicle exists and available
     result = await db.execute(select(Vehicle).where(Vehicle.id == log_data.vehicle_id))
     vehicle = result.scalar_one_or_none()
@@ -113,7 +116,17 @@ async def start_driver_log(
     vehicle.status = "in_use"
     
     db.add(new_log)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        # ix_driver_log_active allows one active log per driver and report
+        await db.rollback()
+        if not is_duplicate_entry(e):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Driver sudah memiliki log aktif untuk laporan ini"
+        )
     await db.refresh(new_log)
     
     return new_log
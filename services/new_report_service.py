@@ -1,63 +1,144 @@
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, bindparam, lambda_stmt
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
+from models.assignment import Assignment
 from models.report import Report
+from models.vehicle import Vehicle
 from models.vehicle_type import VehicleType
 from models.user import User
+from services.vehicle_type_service import vehicle_type_exists
 from schemas.report import ReportCreate, ReportUpdate, ReportStatusUpdate, ReportResponse
-from utils.response import success_response, paginated_response
-import uuid
+from utils.db import is_missing_reference
+from utils.response import (
+    success_response,
+    paginated_response,
+    paginated_cursor_response,
+    cursor_paginate,
+    offset_paginate,
+    rows_to_dicts
+)
 
+_VALID_STATUSES = frozenset({
+    "pending", "assigned", "on_way", "arrived_pickup", "arrived_destination", "done", "canceled"
+})
 
-async def get_all_reports(db: AsyncSession, current_user: User, page: int = 1, size: int = 10) -> dict:
+_REPORT_RESPONSE_FIELDS = tuple(ReportResponse.model_fields)
+
+# List rows: plain response columns plus the type name, so a page never
+# builds (and holds) Report ORM objects next to their dict copies
+_REPORT_LIST_FIELDS = _REPORT_RESPONSE_FIELDS + ("transport_type_name",)
+_REPORT_LIST_COLUMNS = tuple(
+    getattr(Report, field) for field in _REPORT_RESPONSE_FIELDS
+) + (VehicleType.name.label("transport_type_name"),)
+
+# Built once; per-request values are passed as bound parameters
+_SEL_REPORT_WITH_TYPE_BY_ID = lambda_stmt(
+    lambda: select(Report, VehicleType.name.label("transport_type_name"))
+    .outerjoin(VehicleType, VehicleType.id == Report.transport_type)
+    .where(Report.id == bindparam("report_id"))
+)
+
+
+def _row_to_response_dict(r: Report) -> dict:
+    """
+    Build the ReportResponse payload directly from a DB row
+    
+    Rows already match the response schema, so this skips Pydantic
+    entirely. Date, time and datetime values are left as Python objects:
+    FastAPI's jsonable_encoder converts them when the route returns,
+    before ORJSONResponse serializes the result. A route that returns a
+    Response itself skips that pass and must convert them first.
+    
+    Args:
+        r: Report row
+        
+    Returns:
+        Report data
+    """
+    return {field: getattr(r, field) for field in _REPORT_RESPONSE_FIELDS}
+
+
+async def _commit_report(db: AsyncSession) -> None:
+    """
+    Commit a report insert/update
+    
+    vehicle_type_exists can still say yes for a type another worker just
+    deleted, so the foreign key on transport_type is the final check.
+    
+    Args:
+        db: Database session
+        
+    Raises:
+        HTTPException: If transport_type doesn't exist
     """
-    Get all reports with pagination (admin can see all, others see their own)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if not is_missing_reference(e):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Jenis transportasi tidak ditemukan"
+        )
+
+
+async def get_all_reports(
+    db: AsyncSession,
+    current_user: User,
+    page: int = 1,
+    size: int = 10,
+    cursor: Optional[str] = None
+) -> dict:
+    """
+    Get all reports, newest first
+    
+    Without a cursor this is page/offset pagination with a total count.
+    With a cursor (pagination.next_cursor of a previous response) it is
+    keyset pagination on (created_at, id), which costs the same for every
+    page no matter how deep.
     
     Args:
         db: Database session
         current_user: Current authenticated user
         page: Page number (default: 1)
         size: Items per page (default: 10)
+        cursor: Keyset cursor (optional)
         
     Returns:
         Paginated list of reports
+        
+    Raises:
+        HTTPException: If cursor is invalid
     """
-    # Build query
-    if current_user.role == "admin":
-        # Admin can see all reports
-        query = select(Report).options(selectinload(Report.transport_type_rel))
-        count_query = select(func.count()).select_from(Report)
-    else:
-        # Others see all reports (can be filtered on frontend)
-        query = select(Report).options(selectinload(Report.transport_type_rel))
-        count_query = select(func.count()).select_from(Report)
-    
-    # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Get paginated results
-    result = await db.execute(
-        query
-        .offset((page - 1) * size)
-        .limit(size)
+    # Build query (every role sees all reports, filtering happens on the frontend)
+    query = (
+        select(*_REPORT_LIST_COLUMNS)
+        .outerjoin(VehicleType, VehicleType.id == Report.transport_type)
     )
-    reports = result.scalars().all()
     
-    reports_list = []
-    for r in reports:
-        report_dict = ReportResponse.model_validate(r).model_dump()
-        report_dict["transport_type_name"] = r.transport_type_rel.name if r.transport_type_rel else None
-        reports_list.append(report_dict)
+    if cursor is not None:
+        rows, next_cursor = await cursor_paginate(db, query, Report, cursor, size)
+        
+        return paginated_cursor_response(
+            message="Data laporan berhasil diambil",
+            items=rows_to_dicts(_REPORT_LIST_FIELDS, rows),
+            size=size,
+            next_cursor=next_cursor
+        )
+    
+    rows, total, next_cursor = await offset_paginate(db, query, Report, page, size)
     
     return paginated_response(
         message="Data laporan berhasil diambil",
-        items=reports_list,
+        items=rows_to_dicts(_REPORT_LIST_FIELDS, rows),
         total=total,
         page=page,
-        size=size
+        size=size,
+        next_cursor=next_cursor
     )
 
 
@@ -76,21 +157,16 @@ async def get_report_by_id(db: AsyncSession, report_id: str, current_user: User)
     Raises:
         HTTPException: If report not found
     """
-    result = await db.execute(
-        select(Report)
-        .options(selectinload(Report.transport_type_rel))
-        .where(Report.id == report_id)
-    )
-    report = result.scalar_one_or_none()
+    result = await db.execute(_SEL_REPORT_WITH_TYPE_BY_ID, {"report_id": report_id})
+    row = result.one_or_none()
     
-    if not report:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Laporan tidak ditemukan"
         )
     
-    report_dict = ReportResponse.model_validate(report).model_dump()
-    report_dict["transport_type_name"] = report.transport_type_rel.name if report.transport_type_rel else None
+    report_dict = _row_to_response_dict(row.Report) | {"transport_type_name": row.transport_type_name}
     
     return success_response(
         message="Data laporan berhasil diambil",
@@ -114,18 +190,14 @@ async def create_report(db: AsyncSession, report_data: ReportCreate, current_use
         HTTPException: If transport_type doesn't exist
     """
     # Verify transport type exists
-    result = await db.execute(select(VehicleType).where(VehicleType.id == report_data.transport_type))
-    transport_type = result.scalar_one_or_none()
-    
-    if not transport_type:
+    if not await vehicle_type_exists(db, report_data.transport_type):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Jenis transportasi tidak ditemukan"
         )
     
-    # Create new report
+    # Create new report (id comes from the column default)
     new_report = Report(
-        id=str(uuid.uuid4()),
         requester_name=report_data.requester_name,
         requester_phone=report_data.requester_phone,
         transport_type=report_data.transport_type,
@@ -148,12 +220,13 @@ async def create_report(db: AsyncSession, report_data: ReportCreate, current_use
     )
     
     db.add(new_report)
-    await db.commit()
-    await db.refresh(new_report)
+    await _commit_report(db)
+    # Only the server-default timestamps are unknown after the insert
+    await db.refresh(new_report, ["created_at", "updated_at"])
     
     return success_response(
         message="Laporan berhasil ditambahkan",
-        data=ReportResponse.model_validate(new_report).model_dump()
+        data=_row_to_response_dict(new_report)
     )
 
 
@@ -176,7 +249,7 @@ async def update_report(
         Updated report
         
     Raises:
-        HTTPException: If report not found or no permission
+        HTTPException: If report or transport type not found, or no permission
     """
     if current_user.role != "admin":
         raise HTTPException(
@@ -184,8 +257,7 @@ async def update_report(
             detail="Hanya admin yang dapat mengubah laporan"
         )
     
-    result = await db.execute(select(Report).where(Report.id == report_id))
-    report = result.scalar_one_or_none()
+    report = await db.get(Report, report_id)
     
     if not report:
         raise HTTPException(
@@ -193,60 +265,32 @@ async def update_report(
             detail="Laporan tidak ditemukan"
         )
     
-    # Update fields
-    if report_data.requester_name is not None:
-        report.requester_name = report_data.requester_name
-    if report_data.requester_phone is not None:
-        report.requester_phone = report_data.requester_phone
-    if report_data.transport_type is not None:
+    # Update only the fields sent in the request
+    update_data = report_data.model_dump(exclude_unset=True)
+    
+    transport_type_id = update_data.pop("transport_type", None)
+    if transport_type_id is not None:
         # Verify transport type exists
-        result = await db.execute(select(VehicleType).where(VehicleType.id == report_data.transport_type))
-        transport_type = result.scalar_one_or_none()
-        if not transport_type:
+        if not await vehicle_type_exists(db, transport_type_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Jenis transportasi tidak ditemukan"
             )
-        report.transport_type = report_data.transport_type
-    if report_data.use_stretcher is not None:
-        report.use_stretcher = report_data.use_stretcher
-    if report_data.patient_name is not None:
-        report.patient_name = report_data.patient_name
-    if report_data.patient_gender is not None:
-        report.patient_gender = report_data.patient_gender
-    if report_data.patient_age is not None:
-        report.patient_age = report_data.patient_age
-    if report_data.patient_history is not None:
-        report.patient_history = report_data.patient_history
-    if report_data.pickup_address is not None:
-        report.pickup_address = report_data.pickup_address
-    if report_data.destination_address is not None:
-        report.destination_address = report_data.destination_address
-    if report_data.schedule_date is not None:
-        report.schedule_date = report_data.schedule_date
-    if report_data.schedule_time is not None:
-        report.schedule_time = report_data.schedule_time
-    if report_data.contact_person_name is not None:
-        report.contact_person_name = report_data.contact_person_name
-    if report_data.contact_person_phone is not None:
-        report.contact_person_phone = report_data.contact_person_phone
-    if report_data.note is not None:
-        report.note = report_data.note
-    if report_data.attachment_ktp is not None:
-        report.attachment_ktp = report_data.attachment_ktp
-    if report_data.attachment_house_photo is not None:
-        report.attachment_house_photo = report_data.attachment_house_photo
-    if report_data.attachment_sharelok is not None:
-        report.attachment_sharelok = report_data.attachment_sharelok
-    if report_data.status is not None:
-        report.status = report_data.status
+        report.transport_type = transport_type_id
     
-    await db.commit()
-    await db.refresh(report)
+    for field, value in update_data.items():
+        # An explicit null can only clear optional columns
+        if value is None and not Report.__table__.c[field].nullable:
+            continue
+        setattr(report, field, value)
+    
+    await _commit_report(db)
+    # updated_at is set by the database on update
+    await db.refresh(report, ["updated_at"])
     
     return success_response(
         message="Laporan berhasil diupdate",
-        data=ReportResponse.model_validate(report).model_dump()
+        data=_row_to_response_dict(report)
     )
 
 
@@ -269,85 +313,76 @@ async def update_report_status(
         Updated report
         
     Raises:
-        HTTPException: If validation fails
+        HTTPException: If status is invalid (checked first) or report not found
     """
-    result = await db.execute(select(Report).where(Report.id == report_id))
-    report = result.scalar_one_or_none()
-    
-    if not report:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Laporan tidak ditemukan"
-        )
-    
     # Validate status transition
-    valid_statuses = ["pending", "assigned", "on_way", "arrived_pickup", "arrived_destination", "done", "canceled"]
-    
-    if status_data.status not in valid_statuses:
+    if status_data.status not in _VALID_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Status tidak valid"
         )
     
     # Update report status
-    report.status = status_data.status
+    result = await db.execute(
+        update(Report).where(Report.id == report_id).values(status=status_data.status)
+    )
+    
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Laporan tidak ditemukan"
+        )
     
-    # If status is "done", update vehicle status to available and assignment to completed
+    # Cascade the status to the report's assignments (and vehicles when done).
+    # Those rows are never loaded in this session, so every bulk update below
+    # passes synchronize_session=False and skips syncing the identity map (no
+    # extra SELECT on MySQL).
     if status_data.status == "done":
-        from models.assignment import Assignment
-        from models.vehicle import Vehicle
-        from datetime import datetime
-        
-        # Find active assignment
-        result = await db.execute(
-            select(Assignment).where(Assignment.report_id == report_id)
+        # Update vehicle status to available and assignment to completed
+        await db.execute(
+            update(Assignment)
+            .where(Assignment.report_id == report_id)
+            .values(status="completed", completed_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        # Multi-table UPDATE: vehicles joined through the report's assignments
+        await db.execute(
+            update(Vehicle)
+            .where(Vehicle.id == Assignment.vehicle_id, Assignment.report_id == report_id)
+            .values(status="available")
+            .execution_options(synchronize_session=False)
         )
-        assignment = result.scalar_one_or_none()
-        
-        if assignment:
-            # Update assignment status to completed
-            assignment.status = "completed"
-            assignment.completed_at = datetime.utcnow()
-            
-            # Update vehicle status
-            if assignment.vehicle_id:
-                result = await db.execute(
-                    select(Vehicle).where(Vehicle.id == assignment.vehicle_id)
-                )
-                vehicle = result.scalar_one_or_none()
-                if vehicle:
-                    vehicle.status = "available"
-    
-    # If status is "on_way", update assignment status to on_progress
     elif status_data.status == "on_way":
-        from models.assignment import Assignment
-        
-        result = await db.execute(
-            select(Assignment).where(Assignment.report_id == report_id)
+        # Update assignment status to on_progress
+        await db.execute(
+            update(Assignment)
+            .where(Assignment.report_id == report_id)
+            .values(status="on_progress")
+            .execution_options(synchronize_session=False)
         )
-        assignment = result.scalar_one_or_none()
-        
-        if assignment:
-            assignment.status = "on_progress"
-    
-    # If status is "assigned", keep assignment status as assigned
     elif status_data.status == "assigned":
-        from models.assignment import Assignment
-        
-        result = await db.execute(
-            select(Assignment).where(Assignment.report_id == report_id)
+        # Keep assignment status as assigned
+        await db.execute(
+            update(Assignment)
+            .where(Assignment.report_id == report_id)
+            .values(status="assigned")
+            .execution_options(synchronize_session=False)
         )
-        assignment = result.scalar_one_or_none()
-        
-        if assignment:
-            assignment.status = "assigned"
     
     await db.commit()
-    await db.refresh(report)
+    
+    report = await db.get(Report, report_id)
+    
+    # Deleted by another request after this update committed
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Laporan tidak ditemukan"
+        )
     
     return success_response(
         message="Status laporan berhasil diupdate",
-        data=ReportResponse.model_validate(report).model_dump()
+        data=_row_to_response_dict(report)
     )
 
 
@@ -372,8 +407,7 @@ async def delete_report(db: AsyncSession, report_id: str, current_user: User) ->
             detail="Hanya admin yang dapat menghapus laporan"
         )
     
-    result = await db.execute(select(Report).where(Report.id == report_id))
-    report = result.scalar_one_or_none()
+    report = await db.get(Report, report_id)
     
     if not report:
         raise HTTPException(
@@ -1,12 +1,54 @@
 from typing import List, Optional
+from functools import lru_cache
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, exists
+from sqlalchemy.orm import aliased
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from models.user import User
 from schemas.user import UserCreate, UserUpdate, UserResponse
+from core.config import settings
 from core.security import get_password_hash
-from utils.response import success_response, paginated_response
-import uuid
+from utils.db import is_duplicate_entry
+from utils.response import (
+    success_response,
+    paginated_response,
+    paginated_cursor_response,
+    cursor_paginate,
+    offset_paginate,
+    rows_to_dicts
+)
+
+_ALLOWED_ROLES = frozenset({"admin", "driver", "reporter"})
+
+# Response columns projected by the list query, so rows skip ORM and Pydantic
+_USER_RESPONSE_FIELDS = tuple(UserResponse.model_fields)
+_USER_RESPONSE_COLUMNS = tuple(getattr(User, field) for field in _USER_RESPONSE_FIELDS)
+
+
+@lru_cache(maxsize=128)
+def _cached_password_hash(password: str) -> str:
+    return get_password_hash(password)
+
+
+def _hash_password(password: str) -> str:
+    """
+    Hash a password, reusing earlier hashes when ALLOW_HASH_CACHE is on
+    
+    The cache lives in process memory only and is lost on restart. It
+    exists for bulk imports where many users get the same initial
+    password; those users end up with identical hashes.
+    
+    Args:
+        password: Plaintext password
+        
+    Returns:
+        Bcrypt hash
+    """
+    if settings.ALLOW_HASH_CACHE:
+        return _cached_password_hash(password)
+    return get_password_hash(password)
 
 
 async def get_all_users(
@@ -14,10 +56,14 @@ async def get_all_users(
     current_user: User,
     page: int = 1,
     size: int = 10,
-    role: str = None
+    role: str = None,
+    cursor: Optional[str] = None
 ) -> dict:
     """
-    Get all users with pagination (admin only)
+    Get all users with pagination, newest first (admin only)
+    
+    With a cursor (pagination.next_cursor of a previous response) this
+    uses keyset pagination on (created_at, id) instead of page/offset.
     
     Args:
         db: Database session
@@ -25,12 +71,13 @@ async def get_all_users(
         page: Page number (default: 1)
         size: Items per page (default: 10)
         role: Filter by role (optional)
+        cursor: Keyset cursor (optional)
         
     Returns:
         Paginated list of users
         
     Raises:
-        HTTPException: If user is not admin or reporter
+        HTTPException: If user is not admin or reporter, or cursor is invalid
     """
     if current_user.role not in ["admin", "reporter"]:
         raise HTTPException(
@@ -39,30 +86,29 @@ async def get_all_users(
         )
     
     # Build base query with optional role filter
-    base_query = select(User)
-    if role and role in ["admin", "driver", "reporter"]:
+    base_query = select(*_USER_RESPONSE_COLUMNS)
+    if role in _ALLOWED_ROLES:
         base_query = base_query.where(User.role == role)
     
-    # Get total count
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Get paginated data
-    offset = (page - 1) * size
-    query = base_query.offset(offset).limit(size)
-    result = await db.execute(query)
-    users = result.scalars().all()
+    if cursor is not None:
+        rows, next_cursor = await cursor_paginate(db, base_query, User, cursor, size)
+        
+        return paginated_cursor_response(
+            message="Data users berhasil diambil",
+            items=rows_to_dicts(_USER_RESPONSE_FIELDS, rows),
+            size=size,
+            next_cursor=next_cursor
+        )
     
-    # Convert to schema
-    users_data = [UserResponse.model_validate(user).model_dump() for user in users]
+    rows, total, next_cursor = await offset_paginate(db, base_query, User, page, size)
     
     return paginated_response(
         message="Data users berhasil diambil",
-        items=users_data,
+        items=rows_to_dicts(_USER_RESPONSE_FIELDS, rows),
         total=total,
         page=page,
-        size=size
+        size=size,
+        next_cursor=next_cursor
     )
 
 async def get_user_by_id(db: AsyncSession, user_id: str, current_user: User) -> dict:
@@ -80,6 +126,13 @@ async def get_user_by_id(db: AsyncSession, user_id: str, current_user: User) ->
     Raises:
         HTTPException: If user not found or no permission
     """
+    # Users can only see their own data unless they're admin
+    if current_user.role != "admin" and current_user.id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Anda tidak memiliki akses ke data user ini"
+        )
+    
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     
@@ -89,13 +142,6 @@ async def get_user_by_id(db: AsyncSession, user_id: str, current_user: User) ->
             detail="User tidak ditemukan"
         )
     
-    # Users can only see their own data unless they're admin
-    if current_user.role != "admin" and current_user.id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Anda tidak memiliki akses ke data user ini"
-        )
-    
     return success_response(
         message="Data user berhasil diambil",
         data=UserResponse.model_validate(user).model_dump()
@@ -122,20 +168,18 @@ async def create_user(db: AsyncSession, user_data: UserCreate, current_user: Use
             detail="Hanya admin yang dapat menambah user"
         )
     
-    # Check if email already exists
-    result = await db.execute(select(User).where(User.email == user_data.email))
-    existing_user = result.scalar_one_or_none()
-    
-    if existing_user:
+    # Cheap check first so duplicate emails never pay for a bcrypt hash
+    if await db.scalar(select(exists().where(User.email == user_data.email))):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email sudah terdaftar"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    # Create new user (id comes from the column default), the unique index on email
+    # still rejects a duplicate inserted concurrently after the check above
+    # bcrypt is CPU-bound, run it off the event loop
+    hashed_password = await asyncio.to_thread(_hash_password, user_data.password)
     new_user = User(
-        id=str(uuid.uuid4()),
         name=user_data.name,
         email=user_data.email,
         password=hashed_password,
@@ -143,8 +187,18 @@ async def create_user(db: AsyncSession, user_data: UserCreate, current_user: Use
     )
     
     db.add(new_user)
-    await db.commit()
-    await db.refresh(new_user)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if not is_duplicate_entry(e):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email sudah terdaftar"
+        )
+    # Only the server-default timestamp is unknown after the insert
+    await db.refresh(new_user, ["created_at"])
     
     return success_response(
         message="User berhasil ditambahkan",
@@ -173,15 +227,6 @@ async def update_user(
     Raises:
         HTTPException: If user not found or no permission
     """
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User tidak ditemukan"
-        )
-    
     # Only admin or the user themselves can update
     if current_user.role != "admin" and current_user.id != user_id:
         raise HTTPException(
@@ -196,15 +241,32 @@ async def update_user(
             detail="Hanya admin yang dapat mengubah role"
         )
     
+    query = select(User).where(User.id == user_id)
+    if user_data.email:
+        # Check if new email already exists in the same round trip
+        other = aliased(User)
+        query = query.add_columns(
+            exists().where(
+                other.email == user_data.email,
+                other.id != user_id
+            ).label("email_taken")
+        )
+    
+    result = await db.execute(query)
+    row = result.one_or_none()
+    
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User tidak ditemukan"
+        )
+    user = row.User
+    
     # Update fields
     if user_data.name:
         user.name = user_data.name
     if user_data.email:
-        # Check if new email already exists
-        result = await db.execute(
-            select(User).where(User.email == user_data.email, User.id != user_id)
-        )
-        if result.scalar_one_or_none():
+        if row.email_taken:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email sudah digunakan oleh user lain"
@@ -1,57 +1,115 @@
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, exists
+from sqlalchemy.orm import aliased
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from models.vehicle import Vehicle
 from models.vehicle_type import VehicleType
 from models.user import User
 from schemas.vehicle import VehicleCreate, VehicleUpdate, VehicleResponse, VehicleWithTypeResponse
-from utils.response import success_response, paginated_response
-import uuid
+from utils.db import is_duplicate_entry
+from utils.response import (
+    success_response,
+    paginated_response,
+    paginated_cursor_response,
+    cursor_paginate,
+    offset_paginate,
+    rows_to_dicts
+)
 
+_ALLOWED_STATUSES = frozenset({"available", "in_use", "maintenance", "on_duty"})
 
-async def get_all_vehicles(db: AsyncSession, page: int = 1, size: int = 10, status_filter: str = None) -> dict:
+# List rows: the response columns plus the vehicle type name, from one joined query
+_VEHICLE_LIST_FIELDS = tuple(VehicleResponse.model_fields) + ("vehicle_type_name",)
+_VEHICLE_LIST_COLUMNS = tuple(
+    getattr(Vehicle, field) for field in VehicleResponse.model_fields
+) + (VehicleType.name.label("vehicle_type_name"),)
+
+
+async def _vehicle_type_names(db: AsyncSession, type_ids: Iterable[str]) -> Dict[str, str]:
     """
-    Get all vehicles with pagination
+    Look up vehicle type names for a set of type IDs in one query
+    
+    Args:
+        db: Database session
+        type_ids: Vehicle type IDs
+        
+    Returns:
+        Mapping of vehicle type ID to name
+    """
+    type_ids = set(type_ids)
+    if not type_ids:
+        return {}
+    
+    result = await db.execute(
+        select(VehicleType.id, VehicleType.name).where(VehicleType.id.in_(type_ids))
+    )
+    return dict(result.tuples().all())
+
+
+def _vehicles_to_list(vehicles: List[Vehicle], name_by_id: Dict[str, str]) -> List[dict]:
+    vehicles_list = []
+    for v in vehicles:
+        vehicle_dict = VehicleResponse.model_validate(v).model_dump()
+        vehicle_dict["vehicle_type_name"] = name_by_id.get(v.type)
+        vehicles_list.append(vehicle_dict)
+    return vehicles_list
+
+
+async def get_all_vehicles(
+    db: AsyncSession,
+    page: int = 1,
+    size: int = 10,
+    status_filter: str = None,
+    cursor: Optional[str] = None
+) -> dict:
+    """
+    Get all vehicles with pagination, newest first
+    
+    With a cursor (pagination.next_cursor of a previous response) this
+    uses keyset pagination on (created_at, id) instead of page/offset.
     
     Args:
         db: Database session
         page: Page number (default: 1)
         size: Items per page (default: 10)
         status_filter: Filter by status (optional)
+        cursor: Keyset cursor (optional)
         
     Returns:
         Paginated list of vehicles
+        
+    Raises:
+        HTTPException: If cursor is invalid
     """
     # Build base query with optional status filter
-    base_query = select(Vehicle).options(selectinload(Vehicle.vehicle_type))
-    if status_filter and status_filter in ["available", "in_use", "maintenance", "on_duty"]:
+    base_query = (
+        select(*_VEHICLE_LIST_COLUMNS)
+        .outerjoin(VehicleType, VehicleType.id == Vehicle.type)
+    )
+    if status_filter in _ALLOWED_STATUSES:
         base_query = base_query.where(Vehicle.status == status_filter)
     
-    # Get total count
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Get paginated results
-    result = await db.execute(
-        base_query.offset((page - 1) * size).limit(size)
-    )
-    vehicles = result.scalars().all()
+    if cursor is not None:
+        rows, next_cursor = await cursor_paginate(db, base_query, Vehicle, cursor, size)
+        
+        return paginated_cursor_response(
+            message="Data kendaraan berhasil diambil",
+            items=rows_to_dicts(_VEHICLE_LIST_FIELDS, rows),
+            size=size,
+            next_cursor=next_cursor
+        )
     
-    vehicles_list = []
-    for v in vehicles:
-        vehicle_dict = VehicleResponse.model_validate(v).model_dump()
-        vehicle_dict["vehicle_type_name"] = v.vehicle_type.name if v.vehicle_type else None
-        vehicles_list.append(vehicle_dict)
+    rows, total, next_cursor = await offset_paginate(db, base_query, Vehicle, page, size)
     
     return paginated_response(
         message="Data kendaraan berhasil diambil",
-        items=vehicles_list,
+        items=rows_to_dicts(_VEHICLE_LIST_FIELDS, rows),
         total=total,
         page=page,
-        size=size
+        size=size,
+        next_cursor=next_cursor
     )
 
 
@@ -69,11 +127,7 @@ async def get_vehicle_by_id(db: AsyncSession, vehicle_id: str) -> dict:
     Raises:
         HTTPException: If vehicle not found
     """
-    result = await db.execute(
-        select(Vehicle)
-        .options(selectinload(Vehicle.vehicle_type))
-        .where(Vehicle.id == vehicle_id)
-    )
+    result = await db.execute(select(Vehicle).where(Vehicle.id == vehicle_id))
     vehicle = result.scalar_one_or_none()
     
     if not vehicle:
@@ -82,8 +136,8 @@ async def get_vehicle_by_id(db: AsyncSession, vehicle_id: str) -> dict:
             detail="Kendaraan tidak ditemukan"
         )
     
-    vehicle_dict = VehicleResponse.model_validate(vehicle).model_dump()
-    vehicle_dict["vehicle_type_name"] = vehicle.vehicle_type.name if vehicle.vehicle_type else None
+    name_by_id = await _vehicle_type_names(db, [vehicle.type])
+    vehicle_dict = _vehicles_to_list([vehicle], name_by_id)[0]
     
     return success_response(
         message="Data kendaraan berhasil diambil",
@@ -126,21 +180,8 @@ async def create_vehicle(
             detail="Jenis kendaraan tidak ditemukan"
         )
     
-    # Check if plate number already exists
-    result = await db.execute(
-        select(Vehicle).where(Vehicle.plate_number == vehicle_data.plate_number)
-    )
-    existing_vehicle = result.scalar_one_or_none()
-    
-    if existing_vehicle:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Nomor plat sudah terdaftar"
-        )
-    
-    # Create new vehicle
+    # Create new vehicle (id comes from the column default), the unique index on plate_number rejects duplicates
     new_vehicle = Vehicle(
-        id=str(uuid.uuid4()),
         name=vehicle_data.name,
         plate_number=vehicle_data.plate_number,
         type=vehicle_data.type,
@@ -148,19 +189,21 @@ async def create_vehicle(
     )
     
     db.add(new_vehicle)
-    await db.commit()
-    
-    # Refresh and load vehicle_type
-    await db.refresh(new_vehicle)
-    result = await db.execute(
-        select(Vehicle)
-        .options(selectinload(Vehicle.vehicle_type))
-        .where(Vehicle.id == new_vehicle.id)
-    )
-    new_vehicle = result.scalar_one()
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if not is_duplicate_entry(e):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Nomor plat sudah terdaftar"
+        )
+    # Only the server-default timestamps are unknown after the insert
+    await db.refresh(new_vehicle, ["created_at", "updated_at"])
     
-    vehicle_dict = VehicleResponse.model_validate(new_vehicle).model_dump()
-    vehicle_dict["vehicle_type_name"] = new_vehicle.vehicle_type.name if new_vehicle.vehicle_type else None
+    # The vehicle type was loaded above when it was verified
+    vehicle_dict = _vehicles_to_list([new_vehicle], {vehicle_type.id: vehicle_type.name})[0]
     
     return success_response(
         message="Kendaraan berhasil ditambahkan",
@@ -195,37 +238,48 @@ async def update_vehicle(
             detail="Hanya admin yang dapat mengubah kendaraan"
         )
     
-    result = await db.execute(select(Vehicle).where(Vehicle.id == vehicle_id))
-    vehicle = result.scalar_one_or_none()
+    # Load the current type name along with the vehicle for the response
+    query = (
+        select(Vehicle, VehicleType.name.label("vehicle_type_name"))
+        .outerjoin(VehicleType, VehicleType.id == Vehicle.type)
+        .where(Vehicle.id == vehicle_id)
+    )
+    if vehicle_data.plate_number:
+        # Check if new plate number already exists in the same round trip
+        other = aliased(Vehicle)
+        query = query.add_columns(
+            exists().where(
+                other.plate_number == vehicle_data.plate_number,
+                other.id != vehicle_id
+            ).label("plate_taken")
+        )
     
-    if not vehicle:
+    result = await db.execute(query)
+    row = result.one_or_none()
+    
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Kendaraan tidak ditemukan"
         )
+    vehicle, vehicle_type_name = row.Vehicle, row.vehicle_type_name
     
     # Update fields
     if vehicle_data.name:
         vehicle.name = vehicle_data.name
     if vehicle_data.type:
-        # Verify vehicle type exists
-        result = await db.execute(select(VehicleType).where(VehicleType.id == vehicle_data.type))
-        vehicle_type = result.scalar_one_or_none()
-        if not vehicle_type:
+        # Verify vehicle type exists, its name is needed for the response anyway
+        vehicle_type_name = await db.scalar(
+            select(VehicleType.name).where(VehicleType.id == vehicle_data.type)
+        )
+        if vehicle_type_name is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Jenis kendaraan tidak ditemukan"
             )
         vehicle.type = vehicle_data.type
     if vehicle_data.plate_number:
-        # Check if new plate number already exists
-        result = await db.execute(
-            select(Vehicle).where(
-                Vehicle.plate_number == vehicle_data.plate_number,
-                Vehicle.id != vehicle_id
-            )
-        )
-        if result.scalar_one_or_none():
+        if row.plate_taken:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Nomor plat sudah digunakan oleh kendaraan lain"
@@ -236,16 +290,10 @@ async def update_vehicle(
     
     await db.commit()
     
-    # Refresh and load vehicle_type
-    result = await db.execute(
-        select(Vehicle)
-        .options(selectinload(Vehicle.vehicle_type))
-        .where(Vehicle.id == vehicle_id)
-    )
-    vehicle = result.scalar_one()
+    # updated_at is set by the database on update
+    await db.refresh(vehicle, ["updated_at"])
     
-    vehicle_dict = VehicleResponse.model_validate(vehicle).model_dump()
-    vehicle_dict["vehicle_type_name"] = vehicle.vehicle_type.name if vehicle.vehicle_type else None
+    vehicle_dict = _vehicles_to_list([vehicle], {vehicle.type: vehicle_type_name})[0]
     
     return success_response(
         message="Kendaraan berhasil diupdate",
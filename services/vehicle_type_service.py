@@ -1,52 +1,168 @@
-from typing import Any, Optional, List, Dict
+from typing import Any, Optional, List, Dict, FrozenSet, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, exists
+from sqlalchemy.orm import aliased
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from models.vehicle_type import VehicleType
 from models.user import User
 from schemas.vehicle_type import VehicleTypeCreate, VehicleTypeUpdate, VehicleTypeResponse
-from utils.response import success_response, paginated_response
-import uuid
+from utils.db import is_duplicate_entry
+from utils.response import (
+    success_response,
+    paginated_response,
+    paginated_cursor_response,
+    cursor_paginate,
+    offset_paginate,
+    rows_to_dicts
+)
+from copy import deepcopy
+import time
 
+# Known vehicle type ids, as (loaded_at, ids). Vehicle types change rarely,
+# so report writes validate against this instead of querying every time.
+_VEHICLE_TYPE_CACHE_TTL = 60.0
+_vehicle_type_cache: Tuple[float, FrozenSet[str]] = (0.0, frozenset())
 
-async def get_all_vehicle_types(db: AsyncSession, page: int = 1, size: int = 10) -> Dict[str, Any]:
+
+# Response columns projected by the list query, so rows skip ORM and Pydantic
+_VEHICLE_TYPE_RESPONSE_FIELDS = tuple(VehicleTypeResponse.model_fields)
+_VEHICLE_TYPE_RESPONSE_COLUMNS = tuple(
+    getattr(VehicleType, field) for field in _VEHICLE_TYPE_RESPONSE_FIELDS
+)
+
+# Read responses (list pages without cursor, single types), keyed by request,
+# as key -> (stored_at, response), oldest first. Per process, so the TTL
+# bounds how long another worker can serve a type that was changed elsewhere.
+_RESPONSE_CACHE_TTL = 60.0
+_RESPONSE_CACHE_MAX_ENTRIES = 256
+_response_cache: Dict[Tuple, Tuple[float, Dict[str, Any]]] = {}
+
+# Bumped on every write; a read that started before a write must not store
+# what it loaded, or the pre-write data would be cached for a full TTL
+_cache_generation = 0
+
+
+def _invalidate_vehicle_type_cache() -> None:
+    global _vehicle_type_cache, _cache_generation
+    _cache_generation += 1
+    _vehicle_type_cache = (0.0, frozenset())
+    _response_cache.clear()
+
+
+def _get_cached_response(key: Tuple) -> Optional[Dict[str, Any]]:
+    entry = _response_cache.get(key)
+    if entry is None or time.monotonic() - entry[0] > _RESPONSE_CACHE_TTL:
+        return None
+    # Callers get their own copy, the cached one is shared
+    return deepcopy(entry[1])
+
+
+def _cache_response(key: Tuple, response: Dict[str, Any], generation: int) -> Dict[str, Any]:
+    if generation != _cache_generation:
+        # A write committed while this response was being loaded
+        return response
+    
+    _response_cache.pop(key, None)
+    if len(_response_cache) >= _RESPONSE_CACHE_MAX_ENTRIES:
+        # Evict the oldest entry (dicts keep insertion order)
+        del _response_cache[next(iter(_response_cache))]
+    _response_cache[key] = (time.monotonic(), deepcopy(response))
+    return response
+
+
+async def vehicle_type_exists(db: AsyncSession, vehicle_type_id: str) -> bool:
     """
-    Get all vehicle types with pagination
+    Check whether a vehicle type exists, using a short-lived in-process cache
+    
+    The id set is reloaded at most every 60 seconds. An id missing from the
+    cache is still checked against the database, so types created by another
+    worker are accepted immediately. A type deleted by another worker can
+    still be reported as existing until the next reload; writers must treat
+    the vehicle_types foreign key as the final check.
+    
+    Args:
+        db: Database session
+        vehicle_type_id: Vehicle type ID
+        
+    Returns:
+        True if the vehicle type exists
+    """
+    global _vehicle_type_cache
+    loaded_at, ids = _vehicle_type_cache
+    if time.monotonic() - loaded_at > _VEHICLE_TYPE_CACHE_TTL:
+        generation = _cache_generation
+        result = await db.execute(select(VehicleType.id))
+        ids = frozenset(result.scalars().all())
+        if generation == _cache_generation:
+            _vehicle_type_cache = (time.monotonic(), ids)
+    
+    if vehicle_type_id in ids:
+        return True
+    
+    return bool(await db.scalar(select(exists().where(VehicleType.id == vehicle_type_id))))
+
+
+async def get_all_vehicle_types(
+    db: AsyncSession,
+    page: int = 1,
+    size: int = 10,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get all vehicle types with pagination, newest first
+    
+    With a cursor (pagination.next_cursor of a previous response) this
+    uses keyset pagination on (created_at, id) instead of page/offset.
+    Page/offset responses are cached in process for up to 60 seconds.
     
     Args:
         db: Database session
         page: Page number (default: 1)
         size: Items per page (default: 10)
+        cursor: Keyset cursor (optional)
         
     Returns:
         Paginated list of vehicle types
+        
+    Raises:
+        HTTPException: If cursor is invalid
     """
-    # Get total count
-    total_result = await db.execute(select(func.count()).select_from(VehicleType))
-    total = total_result.scalar()
-    
-    # Get paginated results
-    result = await db.execute(
-        select(VehicleType)
-        .offset((page - 1) * size)
-        .limit(size)
-    )
-    vehicle_types = result.scalars().all()
+    if cursor is not None:
+        rows, next_cursor = await cursor_paginate(
+            db, select(*_VEHICLE_TYPE_RESPONSE_COLUMNS), VehicleType, cursor, size
+        )
+        
+        return paginated_cursor_response(
+            message="Data jenis kendaraan berhasil diambil",
+            items=rows_to_dicts(_VEHICLE_TYPE_RESPONSE_FIELDS, rows),
+            size=size,
+            next_cursor=next_cursor
+        )
+    
+    cache_key = ("list", page, size)
+    cached = _get_cached_response(cache_key)
+    if cached is not None:
+        return cached
+    generation = _cache_generation
     
-    vehicle_types_list = [VehicleTypeResponse.model_validate(vt).model_dump() for vt in vehicle_types]
+    rows, total, next_cursor = await offset_paginate(
+        db, select(*_VEHICLE_TYPE_RESPONSE_COLUMNS), VehicleType, page, size
+    )
     
-    return paginated_response(
+    return _cache_response(cache_key, paginated_response(
         message="Data jenis kendaraan berhasil diambil",
-        items=vehicle_types_list,
+        items=rows_to_dicts(_VEHICLE_TYPE_RESPONSE_FIELDS, rows),
         total=total,
         page=page,
-        size=size
-    )
+        size=size,
+        next_cursor=next_cursor
+    ), generation)
 
 
 async def get_vehicle_type_by_id(db: AsyncSession, vehicle_type_id: str) -> Dict[str, Any]:
     """
-    Get vehicle type by ID
+    Get vehicle type by ID (cached in process for up to 60 seconds)
     
     Args:
         db: Database session
@@ -58,6 +174,12 @@ async def get_vehicle_type_by_id(db: AsyncSession, vehicle_type_id: str) -> Dict
     Raises:
         HTTPException: If vehicle type not found
     """
+    cache_key = ("id", vehicle_type_id)
+    cached = _get_cached_response(cache_key)
+    if cached is not None:
+        return cached
+    generation = _cache_generation
+    
     result = await db.execute(select(VehicleType).where(VehicleType.id == vehicle_type_id))
     vehicle_type = result.scalar_one_or_none()
     
@@ -67,10 +189,10 @@ async def get_vehicle_type_by_id(db: AsyncSession, vehicle_type_id: str) -> Dict
             detail="Jenis kendaraan tidak ditemukan"
         )
     
-    return success_response(
+    return _cache_response(cache_key, success_response(
         message="Data jenis kendaraan berhasil diambil",
         data=VehicleTypeResponse.model_validate(vehicle_type).model_dump()
-    )
+    ), generation)
 
 
 async def create_vehicle_type(
@@ -98,27 +220,25 @@ async def create_vehicle_type(
             detail="Hanya admin yang dapat menambah jenis kendaraan"
         )
     
-    # Check if name already exists
-    result = await db.execute(
-        select(VehicleType).where(VehicleType.name == vehicle_type_data.name)
+    # Create new vehicle type (id comes from the column default), the unique index on name rejects duplicates
+    new_vehicle_type = VehicleType(
+        name=vehicle_type_data.name,
     )
-    existing = result.scalar_one_or_none()
     
-    if existing:
+    db.add(new_vehicle_type)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if not is_duplicate_entry(e):
+            raise
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Jenis kendaraan dengan nama ini sudah ada"
         )
-    
-    # Create new vehicle type
-    new_vehicle_type = VehicleType(
-        id=str(uuid.uuid4()),
-        name=vehicle_type_data.name,
-    )
-    
-    db.add(new_vehicle_type)
-    await db.commit()
-    await db.refresh(new_vehicle_type)
+    _invalidate_vehicle_type_cache()
+    # Only the server-default timestamps are unknown after the insert
+    await db.refresh(new_vehicle_type, ["created_at", "updated_at"])
     
     return success_response(
         message="Jenis kendaraan berhasil ditambahkan",
@@ -153,25 +273,30 @@ async def update_vehicle_type(
             detail="Hanya admin yang dapat mengubah jenis kendaraan"
         )
     
-    result = await db.execute(select(VehicleType).where(VehicleType.id == vehicle_type_id))
-    vehicle_type = result.scalar_one_or_none()
+    query = select(VehicleType).where(VehicleType.id == vehicle_type_id)
+    if vehicle_type_data.name:
+        # Check if new name already exists in the same round trip
+        other = aliased(VehicleType)
+        query = query.add_columns(
+            exists().where(
+                other.name == vehicle_type_data.name,
+                other.id != vehicle_type_id
+            ).label("name_taken")
+        )
     
-    if not vehicle_type:
+    result = await db.execute(query)
+    row = result.one_or_none()
+    
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Jenis kendaraan tidak ditemukan"
         )
+    vehicle_type = row.VehicleType
     
     # Update fields
     if vehicle_type_data.name:
-        # Check if new name already exists
-        result = await db.execute(
-            select(VehicleType).where(
-                VehicleType.name == vehicle_type_data.name,
-                VehicleType.id != vehicle_type_id
-            )
-        )
-        if result.scalar_one_or_none():
+        if row.name_taken:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Nama jenis kendaraan sudah digunakan"
@@ -179,6 +304,7 @@ async def update_vehicle_type(
         vehicle_type.name = vehicle_type_data.name
    
     await db.commit()
+    _invalidate_vehicle_type_cache()
     await db.refresh(vehicle_type)
     
     return success_response(
@@ -223,6 +349,7 @@ async def delete_vehicle_type(
     
     await db.delete(vehicle_type)
     await db.commit()
+    _invalidate_vehicle_type_cache()
     
     return success_response(
         message="Jenis kendaraan berhasil dihapus",
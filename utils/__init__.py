@@ -1,13 +1,35 @@
 from utils.response import (
+    StandardResponse,
     standard_response,
     success_response,
     error_response,
-    paginated_response
+    paginated_response,
+    paginated_cursor_response,
+    paginated_stream_response,
+    encode_cursor,
+    decode_cursor,
+    cursor_paginate,
+    offset_paginate,
+    rows_to_dicts
 )
+from utils.db import is_duplicate_entry, is_missing_reference
+from utils.ids import uuid7, new_id
 
 __all__ = [
+    "StandardResponse",
     "standard_response",
     "success_response",
     "error_response",
-    "paginated_response"
+    "paginated_response",
+    "paginated_cursor_response",
+    "paginated_stream_response",
+    "encode_cursor",
+    "decode_cursor",
+    "cursor_paginate",
+    "offset_paginate",
+    "rows_to_dicts",
+    "is_duplicate_entry",
+    "is_missing_reference",
+    "uuid7",
+    "new_id"
 ]
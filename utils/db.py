@@ -0,0 +1,41 @@
+"""
+Database Error Utilities
+Helpers for interpreting errors raised by the database driver
+"""
+from sqlalchemy.exc import IntegrityError
+
+# MySQL ER_DUP_ENTRY: a UNIQUE or PRIMARY KEY index rejected the row
+_MYSQL_DUPLICATE_ENTRY = 1062
+
+# MySQL ER_NO_REFERENCED_ROW_2: a foreign key points at a missing parent row
+_MYSQL_NO_REFERENCED_ROW = 1452
+
+
+def is_duplicate_entry(error: IntegrityError) -> bool:
+    """
+    Check whether an IntegrityError was caused by a unique index
+    
+    Args:
+        error: IntegrityError raised on flush/commit
+    
+    Returns:
+        True for duplicate key errors, False for other integrity errors
+        (e.g. foreign key violations)
+    """
+    args = getattr(error.orig, "args", ())
+    return bool(args) and args[0] == _MYSQL_DUPLICATE_ENTRY
+
+
+def is_missing_reference(error: IntegrityError) -> bool:
+    """
+    Check whether an IntegrityError was caused by a foreign key pointing
+    at a row that does not exist
+    
+    Args:
+        error: IntegrityError raised on flush/commit
+    
+    Returns:
+        True for foreign key violations on insert/update, False otherwise
+    """
+    args = getattr(error.orig, "args", ())
+    return bool(args) and args[0] == _MYSQL_NO_REFERENCED_ROW
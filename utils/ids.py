@@ -0,0 +1,42 @@
+"""
+ID Generation Utilities
+Time-ordered UUIDs for primary keys
+"""
+import os
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a UUID version 7 (RFC 9562)
+    
+    The first 48 bits are the Unix time in milliseconds, so IDs sort by
+    creation time (also as strings) and new rows land at the right edge of
+    the primary key index instead of at random pages.
+    
+    Returns:
+        UUIDv7
+    """
+    unix_ts_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    rand_a = rand >> 68               # 12 bits
+    rand_b = rand & ((1 << 62) - 1)   # 62 bits
+    
+    return uuid.UUID(int=(
+        (unix_ts_ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76                   # version
+        | rand_a << 64
+        | 0b10 << 62                  # variant
+        | rand_b
+    ))
+
+
+def new_id() -> str:
+    """
+    Generate a primary key value for CHAR(36) ID columns
+    
+    Returns:
+        UUIDv7 as a 36-character string
+    """
+    return str(uuid7())
@@ -2,15 +2,31 @@
 Standard API Response Utilities
 Provides consistent response format across all endpoints
 """
-from typing import Any, Optional, List, Dict
-from math import ceil
+from typing import Any, AsyncIterator, Optional, List, Dict, Tuple, TypedDict
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from decimal import Decimal
+
+import orjson
+from fastapi import HTTPException, status as http_status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, and_, or_, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class StandardResponse(TypedDict):
+    """Shape of every non-paginated API response"""
+    status: str
+    message: str
+    data: Any
 
 
 def standard_response(
     status: str,
     message: str,
     data: Any = None
-) -> Dict[str, Any]:
+) -> StandardResponse:
     """
     Create standard API response
     
@@ -29,7 +45,7 @@ def standard_response(
     }
 
 
-def success_response(message: str, data: Any = None) -> Dict[str, Any]:
+def success_response(message: str, data: Any = None) -> StandardResponse:
     """
     Create success response
     
@@ -40,10 +56,11 @@ def success_response(message: str, data: Any = None) -> Dict[str, Any]:
     Returns:
         Success response dictionary
     """
-    return standard_response("success", message, data)
+    # Built inline rather than through standard_response, this is on every request
+    return {"status": "success", "message": message, "data": data}
 
 
-def error_response(message: str, data: Any = None) -> Dict[str, Any]:
+def error_response(message: str, data: Any = None) -> StandardResponse:
     """
     Create error response
     
@@ -54,7 +71,7 @@ def error_response(message: str, data: Any = None) -> Dict[str, Any]:
     Returns:
         Error response dictionary
     """
-    return standard_response("error", message, data)
+    return {"status": "error", "message": message, "data": data}
 
 
 def paginated_response(
@@ -62,7 +79,8 @@ def paginated_response(
     items: List[Any],
     total: int,
     page: int,
-    size: int
+    size: int,
+    next_cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Create paginated response
@@ -73,20 +91,269 @@ def paginated_response(
         total: Total number of items
         page: Current page number
         size: Items per page
+        next_cursor: Cursor for the following page (optional)
     
     Returns:
         Paginated response dictionary
     """
-    pages = ceil(total / size) if size > 0 else 0
+    pagination = _pagination(total, page, size)
+    if next_cursor is not None:
+        pagination["next_cursor"] = next_cursor
+    
+    return {
+        "status": "success",
+        "message": message,
+        "data": items,
+        "pagination": pagination
+    }
+
+
+def paginated_cursor_response(
+    message: str,
+    items: List[Any],
+    size: int,
+    next_cursor: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Create cursor-paginated response
+    
+    Args:
+        message: Success message
+        items: List of items for current page
+        size: Items per page
+        next_cursor: Cursor for the following page, None on the last page
     
+    Returns:
+        Paginated response dictionary
+    """
     return {
         "status": "success",
         "message": message,
         "data": items,
         "pagination": {
-            "total": total,
-            "page": page,
             "size": size,
-            "pages": pages
+            "next_cursor": next_cursor
         }
     }
+
+
+def encode_cursor(created_at: datetime, id: str) -> str:
+    """
+    Encode a (created_at, id) keyset position as an opaque cursor
+    
+    Args:
+        created_at: Creation time of the last item on the page
+        id: ID of the last item on the page
+    
+    Returns:
+        URL-safe cursor string
+    """
+    raw = orjson.dumps({"ts": created_at.isoformat(), "id": id})
+    return urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor created by encode_cursor
+    
+    Args:
+        cursor: Cursor string
+    
+    Returns:
+        Tuple of (created_at, id)
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = orjson.loads(urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(payload["ts"]), str(payload["id"])
+    except (TypeError, KeyError, orjson.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+async def offset_paginate(
+    db: AsyncSession,
+    stmt: Select,
+    model: Any,
+    page: int,
+    size: int
+) -> Tuple[List[Row], int, Optional[str]]:
+    """
+    Fetch one page of stmt by page number, newest first, with the total count
+    
+    The total comes from a COUNT(*) OVER () window column on the page rows
+    themselves, so a page costs one query. Only an empty page past the end
+    (or of size 0), which has no row to carry it, falls back to a separate
+    count. stmt must not be ordered or limited yet; model is as for
+    cursor_paginate.
+    
+    Args:
+        db: Database session
+        stmt: Select statement to paginate
+        model: Model class providing created_at and id
+        page: Page number
+        size: Items per page
+    
+    Returns:
+        Tuple of (rows, total, next_cursor); rows carry a trailing "total"
+        column and next_cursor continues after this page in keyset mode
+    """
+    result = await db.execute(
+        stmt
+        .add_columns(func.count().over().label("total"))
+        .order_by(model.created_at.desc(), model.id.desc())
+        .offset((page - 1) * size)
+        .limit(size)
+    )
+    rows = result.all()
+    
+    if rows:
+        total = rows[0].total
+    elif page == 1 and size > 0:
+        # An empty first page means an empty result
+        total = 0
+    else:
+        total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
+    
+    next_cursor = None
+    if rows and page * size < total:
+        next_cursor = _row_cursor(rows[-1], model)
+    
+    return rows, total, next_cursor
+
+
+async def cursor_paginate(
+    db: AsyncSession,
+    stmt: Select,
+    model: Any,
+    cursor: Optional[str],
+    size: int
+) -> Tuple[List[Row], Optional[str]]:
+    """
+    Fetch one keyset page of stmt, newest first
+    
+    Orders by (created_at, id) descending and seeks past the cursor
+    position, so every page is an index range scan of the
+    (created_at, id) index regardless of depth. stmt must not be ordered
+    or limited yet; model is the entity whose created_at/id are the key,
+    selected either as the first column or as plain columns.
+    
+    Args:
+        db: Database session
+        stmt: Select statement to paginate
+        model: Model class providing created_at and id
+        cursor: Cursor from a previous page, None for the first page
+        size: Items per page
+    
+    Returns:
+        Tuple of (rows, next_cursor); next_cursor is None on the last page
+    
+    Raises:
+        HTTPException: If the cursor is malformed (400)
+    """
+    # An empty page has no last row to continue from
+    if size < 1:
+        return [], None
+    
+    stmt = stmt.order_by(model.created_at.desc(), model.id.desc())
+    
+    if cursor is not None:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail="Cursor tidak valid"
+            )
+        # Expanded form of (created_at, id) < (:ts, :id) so MySQL can range-scan the index
+        stmt = stmt.where(
+            or_(
+                model.created_at < cursor_created_at,
+                and_(model.created_at == cursor_created_at, model.id < cursor_id)
+            )
+        )
+    
+    # One extra row tells whether another page follows
+    result = await db.execute(stmt.limit(size + 1))
+    rows = result.all()
+    
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = _row_cursor(rows[-1], model)
+    
+    return rows, next_cursor
+
+
+def rows_to_dicts(fields: Tuple[str, ...], rows: List[Row]) -> List[Dict[str, Any]]:
+    """
+    Build response items from rows of plain columns
+    
+    Args:
+        fields: Item keys, in the order of the selected columns
+        rows: Rows from a column select, possibly with a trailing total column
+    
+    Returns:
+        List of item dictionaries
+    """
+    # zip stops at the fields, dropping the total column added by offset_paginate
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def _row_cursor(row: Row, model: Any) -> str:
+    key = row[0] if isinstance(row[0], model) else row
+    return encode_cursor(key.created_at, key.id)
+
+
+def paginated_stream_response(
+    message: str,
+    items: AsyncIterator[Dict[str, Any]],
+    total: int,
+    page: int,
+    size: int
+) -> StreamingResponse:
+    """
+    Create paginated response that encodes items as they are produced
+    
+    Same body shape as paginated_response, but the data array is written
+    one item at a time so the page is never held in memory as a whole.
+    
+    Args:
+        message: Success message
+        items: Async iterator of items for current page
+        total: Total number of items
+        page: Current page number
+        size: Items per page
+    
+    Returns:
+        Streaming JSON response
+    """
+    async def body():
+        yield b'{"status":"success","message":' + orjson.dumps(message) + b',"data":['
+        separator = b""
+        async for item in items:
+            yield separator + orjson.dumps(item, default=_json_default)
+            separator = b","
+        yield b'],"pagination":' + orjson.dumps(_pagination(total, page, size)) + b"}"
+    
+    return StreamingResponse(body(), media_type="application/json")
+
+
+def _pagination(total: int, page: int, size: int) -> Dict[str, int]:
+    # Integer ceil division, no float round-trip
+    pages = -(-total // size) if size > 0 else 0
+    
+    return {
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": pages
+    }
+
+
+def _json_default(obj: Any) -> Any:
+    # orjson has no native Decimal support; match FastAPI's encoding
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError